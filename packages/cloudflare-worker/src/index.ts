@@ -192,6 +192,17 @@ const TOOLS = [
   },
 ];
 
+// Static response pieces are built once per isolate instead of on every request.
+const TOOLS_LIST_RESULT = {
+  tools: TOOLS.map(t => ({ name: t.name, title: t.title, description: t.description, inputSchema: t.inputSchema })),
+};
+
+const CORS_HEADERS: Record<string, string> = {
+  'Access-Control-Allow-Origin': '*',
+  'Access-Control-Allow-Methods': 'GET, POST, DELETE, OPTIONS',
+  'Access-Control-Allow-Headers': 'Content-Type, Authorization, Accept',
+};
+
 // ─── Helper: Generate Run ID ───────────────────────────────
 function generateRunId(): string {
   const chars = 'abcdefghijklmnopqrstuvwxyz0123456789';
@@ -251,6 +262,19 @@ async function initDB(db: D1Database): Promise<void> {
   `);
 }
 
+// Schema setup runs until it succeeds once in this isolate. Each request awaits its own
+// initDB call (no promise shared across request contexts); concurrent first requests just
+// repeat the idempotent CREATE TABLE IF NOT EXISTS statements.
+let dbInitialized = false;
+
+async function ensureDB(db: D1Database): Promise<void> {
+  if (dbInitialized) {
+    return;
+  }
+  await initDB(db);
+  dbInitialized = true;
+}
+
 // ═══════════════════════════════════════════════════════════
 // WEB AUDIT ENGINE - The "Web Bekcisi" Core
 // ═══════════════════════════════════════════════════════════
@@ -955,14 +979,8 @@ export default {
   async fetch(request: Request, env: Env): Promise<Response> {
     const url = new URL(request.url);
 
-    const corsHeaders: Record<string, string> = {
-      'Access-Control-Allow-Origin': '*',
-      'Access-Control-Allow-Methods': 'GET, POST, DELETE, OPTIONS',
-      'Access-Control-Allow-Headers': 'Content-Type, Authorization, Accept',
-    };
-
     if (request.method === 'OPTIONS') {
-      return new Response(null, { status: 204, headers: corsHeaders });
+      return new Response(null, { status: 204, headers: CORS_HEADERS });
     }
 
     if (url.pathname === '/health') {
@@ -970,7 +988,7 @@ export default {
     }
 
     if (url.pathname === '/mcp') {
-      try { await initDB(env.DB); } catch {}
+      try { await ensureDB(env.DB); } catch {}
 
       if (request.method === 'GET') {
         const stream = new ReadableStream({
@@ -986,12 +1004,12 @@ export default {
           },
         });
         return new Response(stream, {
-          headers: { 'Content-Type': 'text/event-stream', ...corsHeaders },
+          headers: { 'Content-Type': 'text/event-stream', ...CORS_HEADERS },
         });
       }
 
       if (request.method === 'DELETE') {
-        return new Response(null, { status: 204, headers: corsHeaders });
+        return new Response(null, { status: 204, headers: CORS_HEADERS });
       }
 
       if (request.method === 'POST') {
@@ -1021,21 +1039,21 @@ export default {
           
           if (accept.includes('text/event-stream')) {
             return new Response(`event: message\ndata: ${JSON.stringify({ jsonrpc: '2.0', id, result })}\n\n`, {
-              headers: { 'Content-Type': 'text/event-stream', ...corsHeaders },
+              headers: { 'Content-Type': 'text/event-stream', ...CORS_HEADERS },
             });
           }
-          return Response.json({ jsonrpc: '2.0', id, result }, { headers: corsHeaders });
+          return Response.json({ jsonrpc: '2.0', id, result }, { headers: CORS_HEADERS });
         }
 
         if (method === 'tools/list') {
-          const result = { tools: TOOLS.map(t => ({ name: t.name, title: t.title, description: t.description, inputSchema: t.inputSchema })) };
+          const result = TOOLS_LIST_RESULT;
           
           if (accept.includes('text/event-stream')) {
             return new Response(`event: message\ndata: ${JSON.stringify({ jsonrpc: '2.0', id, result })}\n\n`, {
-              headers: { 'Content-Type': 'text/event-stream', ...corsHeaders },
+              headers: { 'Content-Type': 'text/event-stream', ...CORS_HEADERS },
             });
           }
-          return Response.json({ jsonrpc: '2.0', id, result }, { headers: corsHeaders });
+          return Response.json({ jsonrpc: '2.0', id, result }, { headers: CORS_HEADERS });
         }
 
         if (method === 'tools/call') {
@@ -1047,25 +1065,25 @@ export default {
 
           if (accept.includes('text/event-stream')) {
             return new Response(`event: message\ndata: ${JSON.stringify({ jsonrpc: '2.0', id, result })}\n\n`, {
-              headers: { 'Content-Type': 'text/event-stream', ...corsHeaders },
+              headers: { 'Content-Type': 'text/event-stream', ...CORS_HEADERS },
             });
           }
-          return Response.json({ jsonrpc: '2.0', id, result }, { headers: corsHeaders });
+          return Response.json({ jsonrpc: '2.0', id, result }, { headers: CORS_HEADERS });
         }
 
         if (method === 'ping') {
           if (accept.includes('text/event-stream')) {
             return new Response(`event: message\ndata: ${JSON.stringify({ jsonrpc: '2.0', id, result: {} })}\n\n`, {
-              headers: { 'Content-Type': 'text/event-stream', ...corsHeaders },
+              headers: { 'Content-Type': 'text/event-stream', ...CORS_HEADERS },
             });
           }
-          return Response.json({ jsonrpc: '2.0', id, result: {} }, { headers: corsHeaders });
+          return Response.json({ jsonrpc: '2.0', id, result: {} }, { headers: CORS_HEADERS });
         }
 
         return Response.json({ jsonrpc: '2.0', error: { code: -32601, message: 'Method not found' }, id });
       }
     }
 
-    return Response.json({ error: 'Not found' }, { status: 404, headers: corsHeaders });
+    return Response.json({ error: 'Not found' }, { status: 404, headers: CORS_HEADERS });
   },
 };
@@ -0,0 +1,79 @@
+import { dirname, resolve } from 'node:path';
+import { fileURLToPath } from 'node:url';
+
+import { Client } from '@modelcontextprotocol/sdk/client/index.js';
+import { StdioClientTransport } from '@modelcontextprotocol/sdk/client/stdio.js';
+
+const scriptDir = dirname(fileURLToPath(import.meta.url));
+const packageDir = resolve(scriptDir, '..');
+const serverEntry = resolve(packageDir, 'dist/index.js');
+
+function extractText(result) {
+  return (result.content ?? [])
+    .filter((item) => item.type === 'text')
+    .map((item) => item.text)
+    .join('\n');
+}
+
+function parseJsonPayload(text, context) {
+  try {
+    return JSON.parse(text);
+  } catch {
+    throw new Error(`${context}: ${text || 'empty response'}`);
+  }
+}
+
+function shouldFallbackToWorkingTree(error) {
+  const message = error instanceof Error ? error.message : String(error);
+  return /No changed files|No diff context resolved/i.test(message);
+}
+
+async function callCiSummary(client, argumentsPayload) {
+  const result = await client.callTool({
+    name: 'autoqa_ci_summary',
+    arguments: argumentsPayload,
+  });
+
+  return parseJsonPayload(extractText(result), 'AutoQA MCP returned a non-JSON summary payload');
+}
+
+export async function fetchCiSummary(argumentsPayload, { clientName }) {
+  const client = new Client(
+    {
+      name: clientName,
+      version: '0.1.0',
+    },
+    {
+      capabilities: {},
+    }
+  );
+
+  const transport = new StdioClientTransport({
+    command: process.execPath,
+    args: [serverEntry],
+    stderr: 'inherit',
+  });
+
+  try {
+    await client.connect(transport);
+    try {
+      return await callCiSummary(client, argumentsPayload);
+    } catch (error) {
+      if (
+        argumentsPayload.autoBase &&
+        !argumentsPayload.workingTree &&
+        shouldFallbackToWorkingTree(error)
+      ) {
+        return await callCiSummary(client, {
+          ...argumentsPayload,
+          autoBase: false,
+          workingTree: true,
+          staged: false,
+        });
+      }
+      throw error;
+    }
+  } finally {
+    await client.close().catch(() => {});
+  }
+}
@@ -218,10 +218,13 @@ async function writeDogfoodArtifacts(results, options) {
     results,
   };
 
-  await writeFile(markdownPath, body, 'utf8');
-  await writeFile(jsonPath, `${JSON.stringify(jsonPayload, null, 2)}\n`, 'utf8');
-  await writeFile(latestMarkdownPath, body, 'utf8');
-  await writeFile(latestJsonPath, `${JSON.stringify(jsonPayload, null, 2)}\n`, 'utf8');
+  const jsonBody = `${JSON.stringify(jsonPayload, null, 2)}\n`;
+  await Promise.all([
+    writeFile(markdownPath, body, 'utf8'),
+    writeFile(jsonPath, jsonBody, 'utf8'),
+    writeFile(latestMarkdownPath, body, 'utf8'),
+    writeFile(latestJsonPath, jsonBody, 'utf8'),
+  ]);
 
   return { markdownPath, jsonPath, latestMarkdownPath, latestJsonPath, failed };
 }
@@ -0,0 +1,251 @@
+import { execFile } from 'node:child_process';
+import { mkdir, readFile, writeFile } from 'node:fs/promises';
+import { dirname } from 'node:path';
+import { promisify } from 'node:util';
+
+const execFileAsync = promisify(execFile);
+
+const GITHUB_API_URL = (process.env.GITHUB_API_URL ?? 'https://api.github.com').replace(/\/+$/, '');
+
+const MAX_RATE_LIMIT_WAIT_MS = 60_000;
+const GITHUB_DEFAULT_PER_PAGE = 30;
+
+let tokenPromise;
+const etagCaches = new Map();
+const requestedEtagUrls = new Map();
+
+async function resolveToken() {
+  const envToken = process.env.GH_TOKEN || process.env.GITHUB_TOKEN;
+  if (envToken) {
+    return envToken;
+  }
+
+  try {
+    const { stdout } = await execFileAsync('gh', ['auth', 'token']);
+    const token = stdout.trim();
+    if (token) {
+      return token;
+    }
+  } catch {
+    // Fall through to the authentication error below.
+  }
+
+  throw new Error('GitHub authentication required: set GH_TOKEN or run `gh auth login`.');
+}
+
+function getToken() {
+  tokenPromise ??= resolveToken();
+  return tokenPromise;
+}
+
+function buildUrl(path) {
+  return /^https?:\/\//i.test(path) ? path : `${GITHUB_API_URL}/${path.replace(/^\/+/, '')}`;
+}
+
+async function readErrorMessage(response) {
+  const text = await response.text().catch(() => '');
+  try {
+    const parsed = JSON.parse(text);
+    if (typeof parsed?.message === 'string') {
+      return parsed.message;
+    }
+  } catch {
+    // Non-JSON error body; use the raw text.
+  }
+  return text || response.statusText;
+}
+
+// Errors that should downgrade the PR bot to report-only output instead of failing the job.
+export function shouldReportOnlyOnGhError(error) {
+  const message = error instanceof Error ? error.message : String(error);
+  return (
+    /HTTP 401|HTTP 403|HTTP 429/i.test(message) ||
+    /authentication required/i.test(message) ||
+    /Resource not accessible by integration/i.test(message) ||
+    /insufficient scopes/i.test(message) ||
+    /could not resolve host|ENOTFOUND|EAI_AGAIN/i.test(message) ||
+    /not found/i.test(message)
+  );
+}
+
+function sleep(ms) {
+  return new Promise((resolveSleep) => setTimeout(resolveSleep, ms));
+}
+
+// Returns how long to wait before retrying a 403/429 rate-limit reply, or null when the
+// reply is not rate-limit related (for example a plain permission error).
+function getRateLimitDelayMs(response) {
+  if (response.status !== 403 && response.status !== 429) {
+    return null;
+  }
+
+  const retryAfter = response.headers.get('retry-after')?.trim();
+  if (retryAfter && Number.isFinite(Number(retryAfter))) {
+    return Math.max(Number(retryAfter), 0) * 1000;
+  }
+
+  const reset = response.headers.get('x-ratelimit-reset')?.trim();
+  if (response.headers.get('x-ratelimit-remaining') === '0' && reset && Number.isFinite(Number(reset))) {
+    return Math.max(Number(reset) * 1000 - Date.now(), 0);
+  }
+
+  return null;
+}
+
+function parseNextLink(linkHeader) {
+  const match = linkHeader?.match(/<([^>]+)>;\s*rel="next"/);
+  return match ? match[1] : null;
+}
+
+function isFullPage(url, data) {
+  if (!Array.isArray(data)) {
+    return false;
+  }
+
+  const perPage = Number(new URL(url).searchParams.get('per_page') ?? GITHUB_DEFAULT_PER_PAGE);
+  return data.length >= (Number.isFinite(perPage) && perPage > 0 ? perPage : GITHUB_DEFAULT_PER_PAGE);
+}
+
+async function loadEtagCache(cacheFile) {
+  if (!etagCaches.has(cacheFile)) {
+    etagCaches.set(
+      cacheFile,
+      readFile(cacheFile, 'utf8')
+        .then((raw) => {
+          const parsed = JSON.parse(raw);
+          return parsed && typeof parsed === 'object' && !Array.isArray(parsed) ? parsed : {};
+        })
+        .catch(() => ({}))
+    );
+  }
+  return etagCaches.get(cacheFile);
+}
+
+function markEtagUrlRequested(cacheFile, url) {
+  if (!requestedEtagUrls.has(cacheFile)) {
+    requestedEtagUrls.set(cacheFile, new Set());
+  }
+  requestedEtagUrls.get(cacheFile).add(url);
+}
+
+// Drops cache entries for URLs not requested by this process, so the file only ever holds
+// the pages of the current run instead of growing with every PR it has seen.
+export async function pruneEtagCache(cacheFile) {
+  const entries = await loadEtagCache(cacheFile);
+  const requested = requestedEtagUrls.get(cacheFile) ?? new Set();
+  const staleUrls = Object.keys(entries).filter((url) => !requested.has(url));
+  if (!staleUrls.length) {
+    return;
+  }
+
+  for (const url of staleUrls) {
+    delete entries[url];
+  }
+  await storeEtagCache(cacheFile, entries);
+}
+
+async function storeEtagCache(cacheFile, entries) {
+  try {
+    await mkdir(dirname(cacheFile), { recursive: true });
+    await writeFile(cacheFile, `${JSON.stringify(entries, null, 2)}\n`, 'utf8');
+  } catch {
+    // The cache is an optimization only; a failed write must not fail the request.
+  }
+}
+
+// All calls go through Node's global fetch dispatcher, which keeps connections to
+// api.github.com alive between requests instead of spawning one `gh` process per call.
+// GET requests made with `cacheFile` send the stored ETag as If-None-Match; a 304 reply
+// is served from the cache and does not count against the rate limit.
+export async function githubRequest(path, { method = 'GET', body, cacheFile } = {}) {
+  const token = await getToken();
+  const url = buildUrl(path);
+  const etagCache = cacheFile && method === 'GET' ? await loadEtagCache(cacheFile) : null;
+  const cached = etagCache?.[url];
+  if (etagCache) {
+    markEtagUrlRequested(cacheFile, url);
+  }
+  const headers = {
+    Accept: 'application/vnd.github+json',
+    Authorization: `Bearer ${token}`,
+    'User-Agent': 'autoqa-pr-bot',
+    'X-GitHub-Api-Version': '2022-11-28',
+  };
+  if (body !== undefined) {
+    headers['Content-Type'] = 'application/json';
+  }
+  if (typeof cached?.etag === 'string') {
+    headers['If-None-Match'] = cached.etag;
+  }
+
+  const send = async (requestHeaders = headers) => {
+    try {
+      return await fetch(url, {
+        method,
+        headers: requestHeaders,
+        ...(body !== undefined ? { body: JSON.stringify(body) } : {}),
+      });
+    } catch (error) {
+      const cause = error?.cause?.code ?? (error instanceof Error ? error.message : String(error));
+      throw new Error(`GitHub API ${method} ${path} failed: ${cause}`);
+    }
+  };
+
+  let response = await send();
+  const rateLimitDelayMs = getRateLimitDelayMs(response);
+  if (rateLimitDelayMs !== null) {
+    const remaining = response.headers.get('x-ratelimit-remaining') ?? 'unknown';
+    if (rateLimitDelayMs <= MAX_RATE_LIMIT_WAIT_MS) {
+      process.stderr.write(
+        `GitHub API rate limited on ${method} ${path} (remaining: ${remaining}); retrying in ${Math.ceil(rateLimitDelayMs / 1000)}s.\n`
+      );
+      await response.body?.cancel().catch(() => {});
+      await sleep(rateLimitDelayMs);
+      response = await send();
+    } else {
+      process.stderr.write(
+        `GitHub API rate limited on ${method} ${path} (remaining: ${remaining}); reset is ${Math.ceil(rateLimitDelayMs / 1000)}s away, not retrying.\n`
+      );
+    }
+  }
+
+  if (response.status === 304 && cached) {
+    // A page's ETag only covers its body; the Link header can change underneath it (for
+    // example when a new comment spills onto another page), so pagination always comes
+    // from the live reply. Without a Link header, a short cached page is the last one; only
+    // a full page may have spilled over, so that case is fetched again in full.
+    const link = response.headers.get('link');
+    if (link !== null || !isFullPage(url, cached.data)) {
+      return {
+        data: cached.data,
+        next: parseNextLink(link),
+        status: 304,
+        headers: response.headers,
+      };
+    }
+
+    const { 'If-None-Match': _ignored, ...unconditionalHeaders } = headers;
+    response = await send(unconditionalHeaders);
+  }
+
+  if (!response.ok) {
+    const message = await readErrorMessage(response);
+    throw new Error(`GitHub API ${method} ${path} failed: ${message} (HTTP ${response.status})`);
+  }
+
+  const text = await response.text();
+  const data = text ? JSON.parse(text) : null;
+  const next = parseNextLink(response.headers.get('link'));
+  const etag = response.headers.get('etag');
+  if (etagCache && etag) {
+    etagCache[url] = { etag, data };
+    await storeEtagCache(cacheFile, etagCache);
+  }
+
+  return {
+    data,
+    next,
+    status: response.status,
+    headers: response.headers,
+  };
+}
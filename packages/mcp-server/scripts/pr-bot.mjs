@@ -1,18 +1,16 @@
 #!/usr/bin/env node
 
 import { execFile } from 'node:child_process';
-import { dirname, resolve } from 'node:path';
+import { readFile } from 'node:fs/promises';
+import { homedir } from 'node:os';
+import { isAbsolute, join, relative, resolve } from 'node:path';
 import { promisify } from 'node:util';
-import { fileURLToPath } from 'node:url';
 
-import { Client } from '@modelcontextprotocol/sdk/client/index.js';
-import { StdioClientTransport } from '@modelcontextprotocol/sdk/client/stdio.js';
+import { fetchCiSummary } from './autoqa-summary.mjs';
+import { githubRequest, pruneEtagCache, shouldReportOnlyOnGhError } from './github-api.mjs';
 
 const execFileAsync = promisify(execFile);
 
-const scriptDir = dirname(fileURLToPath(import.meta.url));
-const packageDir = resolve(scriptDir, '..');
-const serverEntry = resolve(packageDir, 'dist/index.js');
 const invocationCwd = process.env.INIT_CWD ?? process.cwd();
 const AUTOQA_MARKER = '<!-- autoqa:pr-comment:v1 -->';
 
@@ -28,36 +26,9 @@ function getOption(name, fallback) {
   return process.argv[index + 1];
 }
 
-function extractText(result) {
-  return (result.content ?? [])
-    .filter((item) => item.type === 'text')
-    .map((item) => item.text)
-    .join('\n');
-}
-
-function parseJsonPayload(text, context) {
-  try {
-    return JSON.parse(text);
-  } catch {
-    throw new Error(`${context}: ${text || 'empty response'}`);
-  }
-}
-
-function shouldFallbackToWorkingTree(error) {
-  const message = error instanceof Error ? error.message : String(error);
-  return /No changed files|No diff context resolved/i.test(message);
-}
-
-function shouldReportOnlyOnGhError(error) {
-  const message = error instanceof Error ? error.message : String(error);
-  return (
-    /HTTP 401|HTTP 403/i.test(message) ||
-    /authentication required/i.test(message) ||
-    /Resource not accessible by integration/i.test(message) ||
-    /insufficient scopes/i.test(message) ||
-    /could not resolve host/i.test(message) ||
-    /not found/i.test(message)
-  );
+function isInsideDirectory(parentDir, candidatePath) {
+  const relativePath = relative(parentDir, candidatePath);
+  return relativePath === '' || (!relativePath.startsWith('..') && !isAbsolute(relativePath));
 }
 
 async function runGh(args) {
@@ -65,6 +36,12 @@ async function runGh(args) {
 }
 
 async function resolveRepoOwnerAndName() {
+  // GitHub Actions already provides the repository; skip the `gh repo view` API call there.
+  const actionsRepository = process.env.GITHUB_REPOSITORY?.trim();
+  if (actionsRepository?.includes('/')) {
+    return actionsRepository;
+  }
+
   const { stdout } = await runGh(['repo', 'view', '--json', 'nameWithOwner', '-q', '.nameWithOwner']);
   const nameWithOwner = stdout.trim();
   if (!nameWithOwner.includes('/')) {
@@ -73,11 +50,30 @@ async function resolveRepoOwnerAndName() {
   return nameWithOwner;
 }
 
+async function readPullRequestNumberFromEvent() {
+  if (!process.env.GITHUB_EVENT_PATH) {
+    return null;
+  }
+
+  try {
+    const event = JSON.parse(await readFile(process.env.GITHUB_EVENT_PATH, 'utf8'));
+    const number = event?.pull_request?.number ?? event?.number;
+    return Number.isInteger(number) ? String(number) : null;
+  } catch {
+    return null;
+  }
+}
+
 async function resolvePullRequestNumber(explicitPrNumber) {
   if (explicitPrNumber) {
     return explicitPrNumber;
   }
 
+  const eventPrNumber = await readPullRequestNumberFromEvent();
+  if (eventPrNumber) {
+    return eventPrNumber;
+  }
+
   const { stdout } = await runGh(['pr', 'view', '--json', 'number', '-q', '.number']);
   const prNumber = stdout.trim();
   if (!prNumber) {
@@ -87,115 +83,71 @@ async function resolvePullRequestNumber(explicitPrNumber) {
 }
 
 async function fetchAutoQaSummary(argumentsPayload) {
-  const client = new Client(
-    {
-      name: 'autoqa-pr-bot',
-      version: '0.1.0',
-    },
-    {
-      capabilities: {},
-    }
-  );
-
-  const transport = new StdioClientTransport({
-    command: process.execPath,
-    args: [serverEntry],
-    stderr: 'inherit',
-  });
-
-  try {
-    await client.connect(transport);
-    let payload;
-    try {
-      const result = await client.callTool({
-        name: 'autoqa_ci_summary',
-        arguments: argumentsPayload,
-      });
-      payload = parseJsonPayload(extractText(result), 'AutoQA MCP returned a non-JSON summary payload');
-    } catch (error) {
-      if (
-        argumentsPayload.autoBase &&
-        !argumentsPayload.workingTree &&
-        shouldFallbackToWorkingTree(error)
-      ) {
-        const fallbackResult = await client.callTool({
-          name: 'autoqa_ci_summary',
-          arguments: {
-            ...argumentsPayload,
-            autoBase: false,
-            workingTree: true,
-            staged: false,
-          },
-        });
-        payload = parseJsonPayload(
-          extractText(fallbackResult),
-          'AutoQA MCP returned a non-JSON summary payload'
-        );
-      } else {
-        throw error;
-      }
-    }
-
-    if (typeof payload.summary !== 'string' || !payload.summary.includes(AUTOQA_MARKER)) {
-      throw new Error('AutoQA summary did not include a valid PR marker.');
-    }
-    return payload.summary;
-  } finally {
-    await client.close().catch(() => {});
+  const payload = await fetchCiSummary(argumentsPayload, { clientName: 'autoqa-pr-bot' });
+  if (typeof payload.summary !== 'string' || !payload.summary.includes(AUTOQA_MARKER)) {
+    throw new Error('AutoQA summary did not include a valid PR marker.');
   }
+  return payload.summary;
 }
 
 async function findExistingAutoQaComment(ownerAndName, prNumber) {
-  const { stdout } = await runGh([
-    'api',
-    `repos/${ownerAndName}/issues/${prNumber}/comments?per_page=100`,
-  ]);
-
-  const comments = JSON.parse(stdout);
-  if (!Array.isArray(comments)) {
-    return null;
-  }
+  // Busy PRs can have more than one page of comments; the bot comment may sit on any of them.
+  let nextPath = `repos/${ownerAndName}/issues/${prNumber}/comments?per_page=100`;
+  let existingCommentId = null;
+
+  while (nextPath) {
+    const { data: comments, next } = await githubRequest(nextPath, { cacheFile: githubCacheFile });
+    if (!Array.isArray(comments)) {
+      break;
+    }
 
-  const matched = comments
-    .filter(
-      (comment) =>
+    for (let index = comments.length - 1; index >= 0; index -= 1) {
+      const comment = comments[index];
+      if (
         comment &&
         typeof comment.id !== 'undefined' &&
         typeof comment.body === 'string' &&
         comment.body.includes(AUTOQA_MARKER)
-    )
-    .map((comment) => String(comment.id));
+      ) {
+        existingCommentId = String(comment.id);
+        break;
+      }
+    }
+    nextPath = next;
+  }
 
-  return matched.length ? matched[matched.length - 1] : null;
+  if (githubCacheFile) {
+    await pruneEtagCache(githubCacheFile);
+  }
+  return existingCommentId;
 }
 
-async function upsertAutoQaComment(ownerAndName, prNumber, summaryBody) {
+async function resolveCommentTarget(explicitPrNumber) {
+  const [ownerAndName, prNumber] = await Promise.all([
+    resolveRepoOwnerAndName(),
+    resolvePullRequestNumber(explicitPrNumber),
+  ]);
   const existingCommentId = await findExistingAutoQaComment(ownerAndName, prNumber);
+  return { ownerAndName, prNumber, existingCommentId };
+}
+
+async function upsertAutoQaComment(target, summaryBody) {
+  const { ownerAndName, prNumber, existingCommentId } = target;
 
   if (existingCommentId) {
-    await runGh([
-      'api',
-      `repos/${ownerAndName}/issues/comments/${existingCommentId}`,
-      '--method',
-      'PATCH',
-      '--field',
-      `body=${summaryBody}`,
-    ]);
+    await githubRequest(`repos/${ownerAndName}/issues/comments/${existingCommentId}`, {
+      method: 'PATCH',
+      body: { body: summaryBody },
+    });
     return { mode: 'updated', commentId: existingCommentId };
   }
 
-  const { stdout } = await runGh([
-    'api',
-    `repos/${ownerAndName}/issues/${prNumber}/comments`,
-    '--method',
-    'POST',
-    '--field',
-    `body=${summaryBody}`,
-    '--jq',
-    '.id',
-  ]);
+  const { data: created } = await githubRequest(`repos/${ownerAndName}/issues/${prNumber}/comments`, {
+    method: 'POST',
+    body: { body: summaryBody },
+  });
 
-  return { mode: 'created', commentId: stdout.trim() };
+  return { mode: 'created', commentId: String(created?.id ?? '') };
 }
 
 if (getFlag('--help')) {
@@ -220,6 +172,15 @@ if (getFlag('--help')) {
 }
 
 const repoPath = resolve(invocationCwd, getOption('--repo', '.'));
+// The ETag cache lives outside the analysed repository; CI persists this directory with actions/cache.
+const githubCacheDir = resolve(
+  process.env.AUTOQA_CACHE_DIR ?? join(process.env.XDG_CACHE_HOME ?? join(homedir(), '.cache'), 'autoqa')
+);
+// The comment lookup runs while the MCP server scans repoPath, so it must never write there:
+// an AUTOQA_CACHE_DIR pointing into the analysed repo disables the cache instead.
+const githubCacheFile = isInsideDirectory(repoPath, githubCacheDir)
+  ? undefined
+  : join(githubCacheDir, 'github-etags.json');
 const prNumber = getOption('--pr', undefined);
 const baseRef = getOption('--base-ref', undefined);
 const headRef = getOption('--head-ref', undefined);
@@ -229,6 +190,15 @@ const reportOnly = getFlag('--report-only');
 const dryRun = getFlag('--dry-run');
 
 try {
+  // Target resolution and the existing-comment lookup do not depend on the summary,
+  // so run them while the MCP server is generating it.
+  const targetPromise =
+    dryRun || reportOnly
+      ? null
+      : resolveCommentTarget(prNumber).then(
+          (target) => ({ target }),
+          (error) => ({ error })
+        );
   const summary = await fetchAutoQaSummary({
     repoPath,
     autoBase: !workingTree && !baseRef,
@@ -249,11 +219,15 @@ try {
   }
 
   try {
-    const ownerAndName = await resolveRepoOwnerAndName();
-    const resolvedPrNumber = await resolvePullRequestNumber(prNumber);
-    const result = await upsertAutoQaComment(ownerAndName, resolvedPrNumber, summary);
+    const resolved = await targetPromise;
+    if (resolved.error) {
+      throw resolved.error;
+    }
+
+    const { target } = resolved;
+    const result = await upsertAutoQaComment(target, summary);
     process.stdout.write(
-      `AutoQA PR comment ${result.mode} on ${ownerAndName}#${resolvedPrNumber} (comment id: ${result.commentId}).\n`
+      `AutoQA PR comment ${result.mode} on ${target.ownerAndName}#${target.prNumber} (comment id: ${result.commentId}).\n`
     );
   } catch (error) {
     if (!shouldReportOnlyOnGhError(error)) {
@@ -1,6 +1,7 @@
 import assert from 'node:assert/strict';
 import { execFile } from 'node:child_process';
 import { mkdtemp, mkdir, readFile, rm, writeFile } from 'node:fs/promises';
+import { createServer } from 'node:http';
 import { dirname, join, resolve } from 'node:path';
 import { promisify } from 'node:util';
 import { fileURLToPath } from 'node:url';
@@ -188,11 +189,178 @@ function parseToolPayload(result, expectedToolName) {
   return payload;
 }
 
+async function runGithubApiSmoke() {
+  const requests = [];
+  const state = { commentCount: 100 };
+  const server = createServer((request, response) => {
+    const { pathname, searchParams } = new URL(request.url, 'http://127.0.0.1');
+    const ifNoneMatch = request.headers['if-none-match'] ?? null;
+    requests.push({ pathname, page: searchParams.get('page'), ifNoneMatch });
+    const base = `http://127.0.0.1:${server.address().port}`;
+    const json = { 'Content-Type': 'application/json' };
+
+    if (pathname === '/comments') {
+      const page = searchParams.get('page') ?? '1';
+      if (page === '2') {
+        response.writeHead(200, { ...json, ETag: '"page-2"' });
+        response.end(JSON.stringify([{ id: 101, body: 'second page' }]));
+        return;
+      }
+
+      // Page 1 keeps the same body (and ETag) when a 101st comment spills onto page 2.
+      const link =
+        state.commentCount > 100 ? { Link: `<${base}/comments?per_page=100&page=2>; rel="next"` } : {};
+      if (ifNoneMatch === '"page-1"') {
+        response.writeHead(304, { ETag: '"page-1"', ...(state.withLinkOn304 ? link : {}) });
+        response.end();
+        return;
+      }
+      response.writeHead(200, { ...json, ETag: '"page-1"', ...link });
+      response.end(
+        JSON.stringify(Array.from({ length: 100 }, (_, index) => ({ id: index + 1, body: 'first page' })))
+      );
+      return;
+    }
+
+    if (pathname === '/single-page') {
+      // Single-page listings carry no Link header on either the 200 or the 304.
+      if (ifNoneMatch === '"single"') {
+        response.writeHead(304, { ETag: '"single"' });
+        response.end();
+        return;
+      }
+      response.writeHead(200, { ...json, ETag: '"single"' });
+      response.end(JSON.stringify([{ id: 1, body: 'only page' }, { id: 2, body: 'only page' }]));
+      return;
+    }
+
+    if (pathname === '/retry-after') {
+      const attempts = requests.filter((entry) => entry.pathname === pathname).length;
+      if (attempts === 1) {
+        response.writeHead(403, { ...json, 'Retry-After': '0', 'X-RateLimit-Remaining': '0' });
+        response.end(JSON.stringify({ message: 'You have exceeded a secondary rate limit.' }));
+        return;
+      }
+      response.writeHead(200, json);
+      response.end(JSON.stringify({ ok: true }));
+      return;
+    }
+
+    if (pathname === '/exhausted') {
+      // Budget exhausted but no reset time given: nothing tells us when a retry could succeed.
+      response.writeHead(403, { ...json, 'X-RateLimit-Remaining': '0' });
+      response.end(JSON.stringify({ message: 'API rate limit exceeded' }));
+      return;
+    }
+
+    if (pathname === '/forbidden') {
+      response.writeHead(403, json);
+      response.end(JSON.stringify({ message: 'Resource not accessible by integration' }));
+      return;
+    }
+
+    response.writeHead(404, json);
+    response.end(JSON.stringify({ message: 'Not Found' }));
+  });
+
+  await new Promise((resolveListen) => server.listen(0, '127.0.0.1', resolveListen));
+  const previousEnv = { GITHUB_API_URL: process.env.GITHUB_API_URL, GH_TOKEN: process.env.GH_TOKEN };
+  process.env.GITHUB_API_URL = `http://127.0.0.1:${server.address().port}`;
+  process.env.GH_TOKEN = 'smoke-token';
+  const cacheDir = await mkdtemp(join(packageDir, '.tmp-fixtures', 'autoqa-github-cache-'));
+  const cacheFile = join(cacheDir, 'github-etags.json');
+
+  try {
+    const { githubRequest, pruneEtagCache, shouldReportOnlyOnGhError } = await import('./github-api.mjs');
+    const countRequests = (pathname) => requests.filter((entry) => entry.pathname === pathname).length;
+
+    const singlePage = await githubRequest('single-page?per_page=100', { cacheFile });
+    assert.equal(singlePage.status, 200);
+    assert.equal(singlePage.next, null);
+
+    const singleRequestsBefore = countRequests('/single-page');
+    const cachedSinglePage = await githubRequest('single-page?per_page=100', { cacheFile });
+    assert.equal(countRequests('/single-page') - singleRequestsBefore, 1);
+    assert.equal(cachedSinglePage.status, 304);
+    assert.equal(cachedSinglePage.next, null);
+    assert.deepEqual(cachedSinglePage.data, singlePage.data);
+
+    const firstPage = await githubRequest('comments?per_page=100', { cacheFile });
+    assert.equal(firstPage.status, 200);
+    assert.equal(firstPage.next, null);
+
+    state.commentCount = 101;
+    state.withLinkOn304 = true;
+    const linkOn304 = await githubRequest('comments?per_page=100', { cacheFile });
+    assert.equal(linkOn304.status, 304);
+    assert.equal(requests.at(-1).ifNoneMatch, '"page-1"');
+    assert.deepEqual(linkOn304.data, firstPage.data);
+    assert.match(linkOn304.next, /page=2/);
+
+    state.withLinkOn304 = false;
+    const requestsBefore = countRequests('/comments');
+    const noLinkOn304 = await githubRequest('comments?per_page=100', { cacheFile });
+    assert.equal(noLinkOn304.status, 200);
+    assert.match(noLinkOn304.next, /page=2/);
+    assert.equal(countRequests('/comments') - requestsBefore, 2);
+    assert.equal(requests.at(-1).ifNoneMatch, null);
+
+    const secondPage = await githubRequest(noLinkOn304.next, { cacheFile });
+    assert.equal(secondPage.next, null);
+    assert.deepEqual(secondPage.data, [{ id: 101, body: 'second page' }]);
+
+    const pruneCacheFile = join(cacheDir, 'prune-etags.json');
+    await writeFile(
+      pruneCacheFile,
+      JSON.stringify({ 'https://api.github.com/stale': { etag: '"stale"', data: [] } }),
+      'utf8'
+    );
+    await githubRequest('single-page?per_page=100', { cacheFile: pruneCacheFile });
+    await pruneEtagCache(pruneCacheFile);
+    const prunedEntries = JSON.parse(await readFile(pruneCacheFile, 'utf8'));
+    assert.deepEqual(Object.keys(prunedEntries), [`${process.env.GITHUB_API_URL}/single-page?per_page=100`]);
+
+    const retried = await githubRequest('retry-after');
+    assert.deepEqual(retried.data, { ok: true });
+    assert.equal(countRequests('/retry-after'), 2);
+
+    const exhaustedError = await githubRequest('exhausted').catch((error) => error);
+    assert.match(exhaustedError.message, /API rate limit exceeded \(HTTP 403\)$/);
+    assert.equal(countRequests('/exhausted'), 1);
+
+    const forbiddenError = await githubRequest('forbidden').catch((error) => error);
+    assert.ok(forbiddenError instanceof Error);
+    assert.equal(countRequests('/forbidden'), 1);
+    assert.equal(
+      forbiddenError.message,
+      'GitHub API GET forbidden failed: Resource not accessible by integration (HTTP 403)'
+    );
+    assert.ok(shouldReportOnlyOnGhError(forbiddenError));
+
+    const notFoundError = await githubRequest('missing').catch((error) => error);
+    assert.match(notFoundError.message, /Not Found \(HTTP 404\)$/);
+    assert.ok(shouldReportOnlyOnGhError(notFoundError));
+    assert.ok(shouldReportOnlyOnGhError(new Error('GitHub API GET x failed: rate limited (HTTP 429)')));
+    assert.ok(!shouldReportOnlyOnGhError(new Error('GitHub API GET x failed: Server Error (HTTP 500)')));
+  } finally {
+    for (const [key, value] of Object.entries(previousEnv)) {
+      if (value === undefined) {
+        delete process.env[key];
+      } else {
+        process.env[key] = value;
+      }
+    }
+    await new Promise((resolveClose) => server.close(resolveClose));
+    await rm(cacheDir, { recursive: true, force: true }).catch(() => undefined);
+  }
+}
+
 let repoFixturePath;
 
 try {
   await rm(reportsDir, { recursive: true, force: true });
   repoFixturePath = await createRepoFixture();
+  await runGithubApiSmoke();
   const cliVersionResult = await execFileAsync(process.execPath, [cliEntry, '--version']);
   assert.match(cliVersionResult.stdout, new RegExp(`v${packageManifest.version}`));
   await client.connect(transport);
@@ -461,6 +461,7 @@ const MEMORY_MAX_ROUTE_HISTORY = 120;
 const repoSettingsCache = new Map<string, { expiresAt: number; value: RepoSettings }>();
 const repoFileCache = new Map<string, { expiresAt: number; value: string[] }>();
 const diffSignalCache = new Map<string, { expiresAt: number; value: DiffSignal[] }>();
+const globRegexCache = new Map<string, RegExp>();
 
 const server = new Server(
   {
@@ -4081,8 +4082,19 @@ function matchesGlobLike(inputPath: string, pattern: string) {
     );
   }
 
+  return compileGlobPattern(normalizedPattern).test(normalizedPath);
+}
+
+function compileGlobPattern(normalizedPattern: string) {
+  const cached = globRegexCache.get(normalizedPattern);
+  if (cached) {
+    return cached;
+  }
+
   const escaped = normalizedPattern.replace(/[.+?^${}()|[\]\\]/g, '\\$&').replace(/\*/g, '.*');
-  return new RegExp(`^${escaped}$`).test(normalizedPath);
+  const compiled = new RegExp(`^${escaped}$`);
+  globRegexCache.set(normalizedPattern, compiled);
+  return compiled;
 }
 
 function isAutomationMode(value: unknown): value is AutomationMode {
@@ -4429,8 +4441,7 @@ function shouldIgnorePath(relativePath: string, settings: RepoSettings) {
       );
     }
 
-    const escaped = normalizedPattern.replace(/[.+?^${}()|[\]\\]/g, '\\$&').replace(/\*/g, '.*');
-    return new RegExp(`^${escaped}$`).test(normalizedPath);
+    return compileGlobPattern(normalizedPattern).test(normalizedPath);
   });
 }
 
@@ -4854,8 +4865,19 @@ function countOccurrences(haystack: string, needle: string) {
 }
 
 function buildPreview(value: string) {
-  const lines = value.split('\n');
-  return lines.slice(Math.max(lines.length - 8, 0)).join('\n');
+  // Walk back from the end to the last 8 lines instead of splitting the whole file.
+  let cursor = value.length;
+  for (let count = 0; count < 8; count += 1) {
+    if (cursor <= 0) {
+      return value;
+    }
+    cursor = value.lastIndexOf('\n', cursor - 1);
+    if (cursor === -1) {
+      return value;
+    }
+  }
+
+  return value.slice(cursor + 1);
 }
 
 function buildUnifiedDiff(filePath: string, before: string, after: string) {